@@ -10,20 +10,72 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import numpy as np
-from domain.pagerank import PowerIterationEngine
+from domain.kernels import warm_up
+from domain.pagerank import PersonalizationCache, PowerIterationEngine
+from domain.strategies import TeleportDanglingStrategy
 from infrastructure.graph import SparseGraph
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, with native numpy serialization."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
 CORS(app)  # Allow frontend to connect
 
+# Large score and edge payloads dominate response time with the stdlib
+# encoder; use orjson when it is installed
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # Store graphs in memory (in production, use database)
 graphs = {}
 current_graph_id = None
 
+# PageRank runs on a bounded worker pool: the SpMV kernels release the GIL,
+# so concurrent requests use separate cores without oversubscribing them.
+# Numba's thread pool must first be started on the main thread: __main__
+# calls warm_up(), and anything else that serves this app (a WSGI server,
+# a test client) has to call it before the first request
+compute_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+# Largest graph for which /graph/current will serialize the dense matrix
+MAX_MATRIX_NODES = 100
+
+# Personalization vectors are shared by the per-request engines, so polling
+# clients with the same suspicious nodes skip rebuilding them
+personalization_cache = PersonalizationCache()
+
+
+def run_pagerank(engine, graph, suspicious_nodes):
+    """Run one PageRank request on a worker; times only the computation."""
+    start_ns = time.perf_counter_ns()
+    scores = engine.compute(graph, suspicious_nodes=suspicious_nodes)
+    return scores, (time.perf_counter_ns() - start_ns) / 1e6
+
+
 @app.route('/')
 def home():
     return jsonify({
@@ -53,20 +105,29 @@ def create_graph():
     try:
         data = request.json
         
-        # Create graph
-        graph = SparseGraph(directed=data.get('directed', True))
+        # Parse edges into COO arrays; malformed entries are skipped
+        edges = [edge for edge in data.get('edges', []) if len(edge) in (2, 3)]
+        node_index = {}
+        endpoints = np.fromiter(
+            (node_index.setdefault(node, len(node_index))
+             for edge in edges for node in edge[:2]),
+            dtype=np.int64,
+            count=2 * len(edges)
+        )
+        weights = np.fromiter(
+            (edge[2] if len(edge) == 3 else 1.0 for edge in edges),
+            dtype=np.float64,
+            count=len(edges)
+        )
         
-        # Add edges
-        edges = data.get('edges', [])
-        for edge in edges:
-            if len(edge) == 2:
-                source, target = edge
-                weight = 1.0
-            elif len(edge) == 3:
-                source, target, weight = edge
-            else:
-                continue
-            graph.add_edge(source, target, weight)
+        # Create graph in one bulk construction
+        graph = SparseGraph.from_coo(
+            endpoints[0::2],
+            endpoints[1::2],
+            weights,
+            list(node_index),
+            directed=data.get('directed', True)
+        )
         
         # Generate graph ID
         graph_id = f"graph_{len(graphs) + 1}"
@@ -112,9 +173,6 @@ def get_current_graph():
     graph = graphs[current_graph_id]
     nodes = graph.get_nodes()
     
-    # Get adjacency matrix for visualization
-    adj_matrix, node_ids = graph.get_adjacency_matrix()
-    
     edges_list = []
     for source, target, weight in graph.get_edges():
         edges_list.append({
@@ -123,27 +181,41 @@ def get_current_graph():
             'weight': float(weight)
         })
     
-    # Calculate node degrees for visualization
-    node_degrees = []
-    for node in nodes:
-        out_degree = graph.get_out_degree(node)
-        in_degree = graph.get_in_degree(node)
-        node_degrees.append({
+    # Calculate node degrees for visualization, all nodes in one pass
+    out_degrees = graph.get_all_out_degrees().tolist()
+    in_degrees = graph.get_all_in_degrees().tolist()
+    node_degrees = [
+        {
             'id': node,
-            'out_degree': float(out_degree),
-            'in_degree': float(in_degree),
-            'total_degree': float(out_degree + in_degree)
-        })
+            'out_degree': out_degree,
+            'in_degree': in_degree,
+            'total_degree': out_degree + in_degree
+        }
+        for node, out_degree, in_degree in zip(nodes, out_degrees, in_degrees)
+    ]
     
-    return jsonify({
+    response = {
         'success': True,
         'graph_id': current_graph_id,
         'nodes': nodes,
         'node_degrees': node_degrees,
         'edges': edges_list,
-        'adjacency_matrix': adj_matrix.tolist(),
         'directed': graph.directed
-    })
+    }
+    
+    # The dense matrix is O(n^2) in the payload; only send it on request
+    # and only for small graphs, the edge list carries the same data
+    if request.args.get('include_matrix', 'false').lower() == 'true':
+        if len(nodes) > MAX_MATRIX_NODES:
+            return jsonify({
+                'success': False,
+                'error': f'Adjacency matrix is only available for graphs '
+                         f'with at most {MAX_MATRIX_NODES} nodes'
+            }), 400
+        adj_matrix, _ = graph.get_adjacency_matrix()
+        response['adjacency_matrix'] = adj_matrix.tolist()
+    
+    return jsonify(response)
 @app.route('/graph/congress', methods=['GET'])
 def load_congress_graph():
     global current_graph_id
@@ -189,8 +261,7 @@ def create_demo_graph():
         ['C', 'E', 78000], ['D', 'F', 9000], ['E', 'G', 125000],
         ['F', 'H', 8000], ['G', 'A', 95000], ['H', 'B', 11000]
     ]
-    for u, v, w in edges:
-        graph.add_edge(u, v, w)
+    graph.add_edges_from(edges)
     
     graph_id = "demo_graph"
     graphs[graph_id] = graph
@@ -210,29 +281,36 @@ def compute_pagerank():
         graph = graphs[current_graph_id]
         
         # مقداردهی به موتور
+        # Each request has its own engine, since the convergence state is
+        # per run; only the personalization vectors are shared
         engine = PowerIterationEngine(
             damping_factor=data.get('damping_factor', 0.85),
             max_iterations=data.get('max_iterations', 100),
-            tolerance=data.get('tolerance', 1e-8)
+            tolerance=data.get('tolerance', 1e-8),
+            # Rank of accounts without outgoing transactions follows the
+            # suspicion seeds, as /pagerank/compute always did
+            dangling_strategy=TeleportDanglingStrategy(),
+            personalization_cache=personalization_cache
         )
         
-        start_time = datetime.now()
         suspicious_nodes = data.get('suspicious_nodes', {})
         
         # اجرای محاسبات روی گراف موجود
-        pagerank_scores = engine.compute(graph, suspicious_nodes=suspicious_nodes)
+        pagerank_scores, compute_time = compute_pool.submit(
+            run_pagerank, engine, graph, suspicious_nodes
+        ).result()
+        convergence_info = engine.get_convergence_info()
         
-        compute_time = (datetime.now() - start_time).total_seconds() * 1000
-        top_candidates = sorted(pagerank_scores.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_candidates = engine.get_top_fraud_candidates(pagerank_scores, top_k=10)
         
         return jsonify({
             'success': True,
             'compute_time_ms': compute_time,
             'pagerank_scores': pagerank_scores,
             'top_fraud_candidates': [
-                {'node_id': k, 'risk_score': float(v)} for k, v in top_candidates
+                {'node_id': k, 'risk_score': v} for k, v, _ in top_candidates
             ],
-            'convergence_info': engine.get_convergence_info()
+            'convergence_info': convergence_info
         })
         
     except Exception as e:
@@ -286,5 +364,8 @@ def get_analysis_summary():
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Compile the kernels and start Numba's thread pool on the main thread,
+    # before compute_pool runs any of them
+    warm_up()
+    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
 
@@ -0,0 +1,333 @@
+"""
+Compiled kernels for the PageRank power iteration.
+Numba is optional: when it is not installed NUMBA_AVAILABLE is False and
+callers fall back to their scipy.sparse implementation. The CuPy kernels
+are likewise only usable when CuPy and a CUDA device are present, and the
+native SIMD SpMV only once native/spmv.c has been built (see that file).
+"""
+
+import ctypes
+import os
+import threading
+from contextlib import nullcontext
+
+import numpy as np
+
+try:
+    import cupy
+    import cupyx.scipy.sparse as cupy_sparse
+    CUPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    cupy = None
+    cupy_sparse = None
+    CUPY_AVAILABLE = False
+
+try:
+    from numba import njit, prange, threading_layer
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels stay importable."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+# Numba's workqueue threading layer aborts the process when parallel
+# kernels are launched from several threads at once; TBB and OpenMP allow
+# it. Launches are serialized until warm_up() has seen a thread-safe layer
+_launch_lock = threading.Lock()
+_serialize_launches = True
+
+_NATIVE_LIBRARY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'native', 'libspmv.so'
+)
+
+try:
+    _native = ctypes.CDLL(_NATIVE_LIBRARY)
+    _native.csr_spmv_f64.restype = None
+    _native.csr_spmv_f64.argtypes = [
+        np.ctypeslib.ndpointer(np.int32, flags='C_CONTIGUOUS'),
+        np.ctypeslib.ndpointer(np.int32, flags='C_CONTIGUOUS'),
+        np.ctypeslib.ndpointer(np.float64, flags='C_CONTIGUOUS'),
+        np.ctypeslib.ndpointer(np.float64, flags='C_CONTIGUOUS'),
+        np.ctypeslib.ndpointer(np.float64, flags='C_CONTIGUOUS'),
+        ctypes.c_int32
+    ]
+    NATIVE_AVAILABLE = True
+except OSError:  # pragma: no cover - depends on the library being built
+    _native = None
+    NATIVE_AVAILABLE = False
+
+
+def csr_matvec(matrix, x, out):
+    """
+    Compute out = matrix @ x into a preallocated buffer.
+
+    Uses the native SIMD kernel for float64 CSR matrices with int32 indices
+    when it has been built, and scipy.sparse otherwise.
+
+    Args:
+        matrix: scipy CSR matrix
+        x: Dense input vector
+        out: Output buffer of length matrix.shape[0]
+
+    Returns:
+        The output buffer
+    """
+    if (NATIVE_AVAILABLE
+            and matrix.dtype == np.float64
+            and matrix.indices.dtype == np.int32
+            and matrix.indptr.dtype == np.int32
+            and out.dtype == np.float64
+            and out.flags.c_contiguous):
+        _native.csr_spmv_f64(
+            matrix.indptr,
+            matrix.indices,
+            matrix.data,
+            np.ascontiguousarray(x, dtype=np.float64),
+            out,
+            matrix.shape[0]
+        )
+        return out
+
+    out[...] = matrix @ x
+    return out
+
+
+@njit(parallel=True, fastmath=True)
+def ppr_iterate(indptr, indices, data, r, p, dangling_vector, dangling_mask,
+                damping, max_iter, tol):
+    """
+    Run the full power iteration on a CSR transition matrix.
+
+    Each step computes r_new = (1 - α) * (M r + d * v) + α * p, where d is the
+    rank held by dangling nodes and v is the dangling redistribution vector.
+    The SpMV, the scaled add and the L1 convergence reduction share one pass.
+
+    Args:
+        indptr, indices, data: CSR arrays of the column-stochastic matrix M
+        r: Initial rank vector (used as a work buffer, pass a copy)
+        p: Personalization vector
+        dangling_vector: Distribution for rank leaving dangling nodes
+        dangling_mask: Boolean array where True indicates a dangling node
+        damping: α in PageRank formula (probability of teleportation)
+        max_iter: Maximum number of power iterations
+        tol: L1 convergence threshold
+
+    Returns:
+        Tuple of (rank_vector, iterations_performed, converged)
+    """
+    n = r.shape[0]
+    r_new = np.empty_like(r)
+    follow = 1.0 - damping
+
+    for iteration in range(max_iter):
+        dangling_sum = 0.0
+        for i in prange(n):
+            if dangling_mask[i]:
+                dangling_sum += r[i]
+
+        diff = 0.0
+        for i in prange(n):
+            acc = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                acc += data[k] * r[indices[k]]
+            value = follow * (acc + dangling_sum * dangling_vector[i]) + damping * p[i]
+            r_new[i] = value
+            diff += abs(value - r[i])
+
+        r, r_new = r_new, r
+        if diff < tol:
+            return r, iteration + 1, True
+
+    return r, max_iter, False
+
+
+@njit(fastmath=True)
+def small_ppr_iterate(matrix, r, p, dangling_vector, dangling_mask,
+                      damping, max_iter, tol):
+    """
+    Serial power iteration on a small dense transition matrix.
+
+    For graphs of a few dozen nodes the thread launches of ppr_iterate and
+    the per-call overhead of scipy.sparse outweigh the arithmetic, so this
+    kernel runs the whole iteration single-threaded over a dense matrix
+    that fits in L1 cache. Same update and arguments as ppr_iterate, with
+    the CSR arrays replaced by the dense matrix.
+    """
+    n = r.shape[0]
+    r_new = np.empty_like(r)
+    follow = 1.0 - damping
+
+    for iteration in range(max_iter):
+        dangling_sum = 0.0
+        for i in range(n):
+            if dangling_mask[i]:
+                dangling_sum += r[i]
+
+        diff = 0.0
+        for i in range(n):
+            acc = 0.0
+            for j in range(n):
+                acc += matrix[i, j] * r[j]
+            value = follow * (acc + dangling_sum * dangling_vector[i]) + damping * p[i]
+            r_new[i] = value
+            diff += abs(value - r[i])
+
+        r, r_new = r_new, r
+        if diff < tol:
+            return r, iteration + 1, True
+
+    return r, max_iter, False
+
+
+def parallel_launch():
+    """
+    Context manager to hold around calls of the parallel kernels.
+
+    Serializes the launches when the threading layer is not thread-safe
+    (workqueue, or not yet known), and does nothing otherwise.
+    """
+    return _launch_lock if _serialize_launches else nullcontext()
+
+
+def warm_up() -> None:
+    """
+    Compile the power-iteration kernels and start Numba's thread pool.
+
+    Call this from the main thread before running kernels on worker threads:
+    if the TBB threading layer is first started from a worker thread, the
+    interpreter hangs on exit. It also moves the JIT compile out of the
+    first request, and records whether parallel launches from several
+    threads need to be serialized.
+    """
+    global _serialize_launches
+    if not NUMBA_AVAILABLE:
+        return
+    ones = np.ones(1)
+    ppr_iterate(
+        np.array([0, 1], dtype=np.int32),
+        np.zeros(1, dtype=np.int32),
+        ones,
+        ones.copy(),
+        ones,
+        ones,
+        np.zeros(1, dtype=np.bool_),
+        0.85,
+        1,
+        0.0
+    )
+    _serialize_launches = threading_layer() == 'workqueue'
+    small_ppr_iterate(
+        np.ones((1, 1)),
+        ones.copy(),
+        ones,
+        ones,
+        np.zeros(1, dtype=np.bool_),
+        0.85,
+        1,
+        0.0
+    )
+
+
+@njit
+def gauss_seidel_solve(indptr, indices, data, x, b, follow, max_iter, tol):
+    """
+    Solve (I - follow * M) x = b in place with Gauss–Seidel sweeps.
+
+    Rows are updated in order, so each row already sees the values written
+    earlier in the same sweep. The sweep is inherently sequential and is not
+    parallelized. Without Numba this runs as plain Python and is only
+    suitable for small graphs.
+
+    Args:
+        indptr, indices, data: CSR arrays of M (dangling columns empty)
+        x: Initial guess, overwritten with the solution
+        b: Right-hand side
+        follow: Link-following probability (1 - α)
+        max_iter: Maximum number of sweeps
+        tol: L1 threshold on the change made by one sweep
+
+    Returns:
+        Tuple of (solution, sweeps_performed, converged)
+    """
+    n = x.shape[0]
+
+    for sweep in range(max_iter):
+        diff = 0.0
+        for i in range(n):
+            acc = 0.0
+            diagonal = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if j == i:
+                    diagonal += data[k]
+                else:
+                    acc += data[k] * x[j]
+            value = (b[i] + follow * acc) / (1.0 - follow * diagonal)
+            diff += abs(value - x[i])
+            x[i] = value
+
+        if diff < tol:
+            return x, sweep + 1, True
+
+    return x, max_iter, False
+
+
+def gpu_available() -> bool:
+    """Return True when CuPy is installed and can see a CUDA device."""
+    if not CUPY_AVAILABLE:
+        return False
+    try:
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+def gpu_ppr_iterate(transition, r, p, dangling_vector, dangling_mask,
+                    damping, max_iter, tol):
+    """
+    Run the power iteration on the GPU with cuSPARSE SpMVs.
+
+    Same update as ppr_iterate. The matrix and vectors are copied to the
+    device once; each iteration only transfers the scalar L1 difference
+    back, and the final rank vector is copied to the host at the end.
+
+    Args:
+        transition: scipy CSR column-stochastic matrix (dangling columns empty)
+        r: Initial rank vector
+        p: Personalization vector
+        dangling_vector: Distribution for rank leaving dangling nodes
+        dangling_mask: Boolean array where True indicates a dangling node
+        damping: α in PageRank formula (probability of teleportation)
+        max_iter: Maximum number of power iterations
+        tol: L1 convergence threshold
+
+    Returns:
+        Tuple of (rank_vector, iterations_performed, converged)
+    """
+    matrix = cupy_sparse.csr_matrix(transition)
+    r = cupy.asarray(r)
+    p = cupy.asarray(p)
+    dangling_vector = cupy.asarray(dangling_vector)
+    dangling_indices = cupy.asarray(np.flatnonzero(dangling_mask))
+    follow = 1.0 - damping
+
+    for iteration in range(max_iter):
+        # Rank-1 dangling update applied on the full vector, on device
+        dangling_sum = r[dangling_indices].sum()
+        r_new = matrix @ r
+        r_new += dangling_sum * dangling_vector
+        r_new *= follow
+        r_new += damping * p
+
+        diff = float(cupy.abs(r_new - r).sum())
+        r = r_new
+        if diff < tol:
+            return cupy.asnumpy(r), iteration + 1, True
+
+    return cupy.asnumpy(r), max_iter, False
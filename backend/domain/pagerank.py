@@ -3,11 +3,23 @@ PageRank engine implementation using power iteration.
 Implements the formula: r(t+1) = (1 - α) * r(t)M + α * p
 """
 
-from typing import Dict, List, Optional, Tuple
+import threading
+from contextlib import nullcontext
+from typing import Dict, Hashable, List, Optional, Tuple, Union
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import DTypeLike, NDArray
 from scipy import sparse
 
+from .kernels import (
+    NUMBA_AVAILABLE,
+    csr_matvec,
+    gauss_seidel_solve,
+    gpu_available,
+    gpu_ppr_iterate,
+    parallel_launch,
+    ppr_iterate,
+    small_ppr_iterate
+)
 from .strategies import (
     BaseDanglingNodeStrategy, 
     BasePersonalizationStrategy,
@@ -16,18 +28,69 @@ from .strategies import (
 )
 
 
+class PersonalizationCache:
+    """
+    Bounded cache of the personalization vectors built by compute().
+    
+    Each entry keeps the node list it was built for, so a graph change
+    (which replaces the node list) invalidates it. The cache can be shared
+    by engines running on several threads.
+    """
+    
+    def __init__(self, max_size: int = 32):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_size: Number of vectors kept; the oldest is evicted first
+        """
+        self.max_size = max_size
+        self._entries: Dict[Hashable, Tuple[List[str], NDArray]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, node_ids: List[str]) -> Optional[NDArray]:
+        """Return the vector cached under key for this node list, if any."""
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] is node_ids:
+            return cached[1]
+        return None
+    
+    def put(self, key: Hashable, node_ids: List[str], p: NDArray) -> None:
+        """Cache p under key for this node list."""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_size:
+                # Evict the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (node_ids, p)
+
+
 class PowerIterationEngine:
     """
     Personalized PageRank engine for fraud detection using power iteration.
     """
     
+    # Below this many stored entries the host-device copies outweigh the
+    # faster GPU SpMV, so the 'auto' backend stays on the CPU
+    GPU_MIN_NNZ = 100_000
+    
+    # Up to this many nodes the compiled path iterates over a dense copy of
+    # the matrix on one thread; thread launches would dominate the work
+    SMALL_GRAPH_NODES = 64
+    
+    # Number of personalization vectors kept by compute() for reuse
+    P_CACHE_SIZE = 32
+    
     def __init__(
         self,
         damping_factor: float = 0.85,
         max_iterations: int = 100,
         tolerance: float = 1e-8,
         dangling_strategy: Optional[BaseDanglingNodeStrategy] = None,
-        personalization_strategy: Optional[BasePersonalizationStrategy] = None
+        personalization_strategy: Optional[BasePersonalizationStrategy] = None,
+        dtype: DTypeLike = np.float64,
+        backend: str = 'auto',
+        personalization_cache: Optional[PersonalizationCache] = None
     ):
         """
         Initialize the PageRank engine.
@@ -38,66 +101,88 @@ class PowerIterationEngine:
             tolerance: Convergence threshold
             dangling_strategy: Strategy for handling dangling nodes
             personalization_strategy: Strategy for personalization vector
+            dtype: Floating-point type of the rank vectors and matrix values.
+                np.float32 halves the memory traffic of the SpMV; use a
+                tolerance of about 1e-6 or above with it, since the L1
+                difference cannot reliably drop below float32 resolution
+            backend: 'cpu', 'gpu' or 'auto'. 'auto' runs the power iteration
+                on the GPU (CuPy) for matrices with at least GPU_MIN_NNZ
+                entries when a device is available, otherwise on the CPU
+            personalization_cache: Cache for the personalization vectors
+                built by compute(); pass one cache to several engines to
+                share it. Defaults to a private cache of P_CACHE_SIZE entries
         """
         if not 0 < damping_factor < 1:
             raise ValueError("Damping factor must be between 0 and 1")
+        if backend not in ('auto', 'cpu', 'gpu'):
+            raise ValueError("Backend must be 'auto', 'cpu' or 'gpu'")
+        if backend == 'gpu' and not gpu_available():
+            raise RuntimeError("GPU backend requires CuPy and a CUDA device")
         
         self.damping_factor = damping_factor
         self.max_iterations = max_iterations
         self.tolerance = tolerance
+        self.dtype = np.dtype(dtype)
+        self.backend = backend
         
         # Use default strategies if none provided
         self.dangling_strategy = dangling_strategy or UniformDanglingStrategy()
         self.personalization_strategy = personalization_strategy or SuspicionBasedPersonalization()
         
         # Cache for computed values
-        self._transition_matrix: Optional[NDArray[np.float64]] = None
+        self._transition_matrix: Optional[sparse.csr_matrix] = None
+        self._dangling_mask: Optional[NDArray[np.bool_]] = None
         self._personalization_vector: Optional[NDArray[np.float64]] = None
         self._page_rank: Optional[NDArray[np.float64]] = None
         self._iterations_performed: int = 0
         self._converged: bool = False
+        
+        # Personalization vectors built by compute(), keyed by dtype and
+        # suspicion set
+        if personalization_cache is None:
+            personalization_cache = PersonalizationCache(self.P_CACHE_SIZE)
+        self._p_cache = personalization_cache
     
     def build_transition_matrix(
         self,
-        adjacency_matrix: NDArray[np.float64],
-        weights: Optional[NDArray[np.float64]] = None
-    ) -> NDArray[np.float64]:
+        adjacency_matrix: Union[NDArray[np.float64], sparse.spmatrix],
+        weights: Optional[Union[NDArray[np.float64], sparse.spmatrix]] = None
+    ) -> sparse.csr_matrix:
         """
-        Build column-stochastic transition matrix from adjacency matrix.
+        Build column-stochastic CSR transition matrix from adjacency matrix.
+        
+        Dense inputs are converted to CSR once, so memory stays O(nnz).
+        Dangling columns are left empty and recorded in the dangling mask;
+        the solvers redistribute their rank as the dangling strategy's
+        rank-1 term instead of materializing dense columns.
         
         Args:
-            adjacency_matrix: Binary adjacency matrix (n x n)
+            adjacency_matrix: Adjacency matrix (n x n), column j holds j's out-edges
             weights: Optional weight matrix for weighted edges
             
         Returns:
-            Column-stochastic transition matrix
+            Column-stochastic transition matrix in CSR format
         """
         n = adjacency_matrix.shape[0]
         
+        adjacency = sparse.csc_matrix(adjacency_matrix, dtype=np.float64)
         if weights is not None:
-            # Use weighted adjacency
-            weighted_adj = adjacency_matrix * weights
-        else:
-            weighted_adj = adjacency_matrix.astype(np.float64)
+            # Element-wise multiplication keeps the result sparse
+            adjacency = sparse.csc_matrix(adjacency.multiply(weights))
         
         # Identify dangling nodes (columns with zero out-degree)
-        out_degree = weighted_adj.sum(axis=0)
+        out_degree = np.asarray(adjacency.sum(axis=0)).ravel()
         dangling_mask = out_degree == 0
         
-        # Create initial transition matrix
-        transition_matrix = np.zeros((n, n), dtype=np.float64)
-        
-        # Normalize columns to sum to 1 (column-stochastic)
-        for j in range(n):
-            if out_degree[j] > 0:
-                transition_matrix[:, j] = weighted_adj[:, j] / out_degree[j]
-        
-        # Apply dangling node strategy
-        transition_matrix = self.dangling_strategy.handle_dangling_nodes(
-            transition_matrix, dangling_mask
-        )
+        # Normalize columns to sum to 1 (column-stochastic) by scaling with a
+        # diagonal inverse out-degree matrix; dangling columns get zero
+        inv_out_degree = np.zeros(n, dtype=np.float64)
+        np.divide(1.0, out_degree, out=inv_out_degree, where=~dangling_mask)
+        transition_matrix = (adjacency @ sparse.diags(inv_out_degree)).tocsr()
+        transition_matrix = transition_matrix.astype(self.dtype, copy=False)
         
         self._transition_matrix = transition_matrix
+        self._dangling_mask = dangling_mask
         return transition_matrix
     
     def compute_personalization_vector(
@@ -125,36 +210,285 @@ class PowerIterationEngine:
         return personalization
     def compute(self, graph, suspicious_nodes=None):
         matrix, dangling_mask, node_ids = graph.get_normalized_matrix()
+        if not node_ids:
+            return self._empty_page_rank()
+        matrix = matrix.astype(self.dtype, copy=False)
+        p = self._seed_vector(graph, node_ids, suspicious_nodes)
+        dangling_vector = self._dangling_vector(matrix, dangling_mask, p)
+        
+        r = self._power_iterate(matrix, dangling_mask, p, dangling_vector, p.copy())
+        return {node_id: float(score) for node_id, score in zip(node_ids, r)}
+    
+    def compute_page_rank(
+        self,
+        node_ids: List[str],
+        adjacency_matrix: Union[NDArray[np.float64], sparse.spmatrix],
+        suspicious_nodes: Optional[Dict[str, float]] = None,
+        base_weights: Optional[Dict[str, float]] = None,
+        weights: Optional[Union[NDArray[np.float64], sparse.spmatrix]] = None
+    ) -> Dict[str, float]:
+        """
+        Compute Personalized PageRank from an adjacency matrix.
+        
+        Dense and sparse inputs take the same path: the matrix is converted
+        to CSR once by build_transition_matrix, so memory stays O(nnz).
+        
+        Args:
+            node_ids: List of node identifiers
+            adjacency_matrix: Dense or sparse adjacency matrix (n x n),
+                column j holds j's out-edges
+            suspicious_nodes: Suspicion scores for fraud detection
+            base_weights: Base importance weights
+            weights: Optional weight matrix for weighted edges
+            
+        Returns:
+            Dictionary mapping node_id to PageRank score
+        """
         n = len(node_ids)
+        if n == 0:
+            return self._empty_page_rank()
+        
+        transition = self.build_transition_matrix(adjacency_matrix, weights)
+        
+        p = self.compute_personalization_vector(node_ids, suspicious_nodes, base_weights)
+        p = p.astype(self.dtype, copy=False)
+        
+        dangling_vector = self._dangling_vector(transition, self._dangling_mask, p)
+        
+        r = self._power_iterate(
+            transition,
+            self._dangling_mask,
+            p,
+            dangling_vector,
+            np.full(n, 1.0 / n, dtype=self.dtype)
+        )
+        return {node_id: float(score) for node_id, score in zip(node_ids, r)}
     
-        p = np.zeros(n)
-        if suspicious_nodes:
-            for node_id, score in suspicious_nodes.items():
-                if node_id in graph._node_to_idx:
-                    p[graph._node_to_idx[node_id]] = score
+    def _empty_page_rank(self) -> Dict[str, float]:
+        """Result for a graph without nodes, which has nothing to iterate."""
+        self._converged = True
+        self._iterations_performed = 0
+        self._page_rank = np.zeros(0, dtype=self.dtype)
+        return {}
     
-        if np.sum(p) > 0:
-            p /= np.sum(p)
-        else:
-            p = np.ones(n) / n
-
-        r = p.copy()
+    def _dangling_vector(
+        self,
+        transition: sparse.spmatrix,
+        dangling_mask: NDArray[np.bool_],
+        p: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Distribution for rank leaving dangling nodes, from the dangling strategy."""
+        _, _, dangling_vector = self.dangling_strategy.as_operator(
+            transition, dangling_mask, p
+        )
+        return np.asarray(dangling_vector, dtype=self.dtype)
     
-        for iteration in range(self.max_iterations):
-            r_prev = r.copy()
+    def _power_iterate(
+        self,
+        transition: sparse.spmatrix,
+        dangling_mask: NDArray[np.bool_],
+        p: NDArray[np.float64],
+        dangling_vector: NDArray[np.float64],
+        r: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """
+        Run the power iteration on the GPU, the Numba kernels or scipy.sparse.
+        
+        Rank held by dangling nodes is redistributed along dangling_vector;
+        it is applied as one rank-1 term per iteration rather than by
+        materializing dangling columns.
+        
+        Args:
+            transition: Column-stochastic transition matrix (dangling columns empty)
+            dangling_mask: Boolean array where True indicates a dangling node
+            p: Personalization vector
+            dangling_vector: Distribution for rank leaving dangling nodes
+            r: Initial rank vector
+            
+        Returns:
+            Final rank vector
+        """
+        if self._use_gpu(transition):
+            return self._iterate_gpu(transition, dangling_mask, p, dangling_vector, r)
         
-            dangling_sum = np.sum(r_prev[dangling_mask])
+        if NUMBA_AVAILABLE:
+            return self._iterate_compiled(transition, dangling_mask, p, dangling_vector, r)
         
-            r = (1 - self.damping_factor) * (matrix @ r_prev)
-            r += (self.damping_factor + (1 - self.damping_factor) * dangling_sum) * p
+        # Fold (1 - α) into the matrix once so each iteration is one SpMV
+        # followed by in-place adds of the teleport and dangling terms. The
+        # scratch buffer holds the dangling term and is then reused for the
+        # L1 difference
+        scaled_matrix = sparse.csr_matrix((1 - self.damping_factor) * transition)
+        n = r.shape[0]
+        teleport = self.damping_factor * np.asarray(p, dtype=self.dtype)
+        scratch = np.empty(n, dtype=self.dtype)
+        r_new = np.empty(n, dtype=self.dtype)
+        r = np.array(r, dtype=self.dtype)
         
-            diff = np.linalg.norm(r - r_prev, ord=1)
+        for iteration in range(self.max_iterations):
+            dangling_sum = np.sum(r[dangling_mask])
+            
+            csr_matvec(scaled_matrix, r, r_new)
+            r_new += teleport
+            np.multiply(
+                dangling_vector, (1 - self.damping_factor) * dangling_sum, out=scratch
+            )
+            r_new += scratch
+            
+            np.subtract(r_new, r, out=scratch)
+            diff = np.abs(scratch, out=scratch).sum()
+            r, r_new = r_new, r
             if diff < self.tolerance:
                 self._converged = True
                 self._iterations_performed = iteration + 1
                 break
-        return {node_id: float(score) for node_id, score in zip(node_ids, r)}
- 
+        else:
+            self._converged = False
+            self._iterations_performed = self.max_iterations
+        
+        self._page_rank = r
+        return r
+    
+    def _seed_vector(
+        self,
+        graph,
+        node_ids: List[str],
+        suspicious_nodes: Optional[Dict[str, float]]
+    ) -> NDArray:
+        """
+        Build the normalized personalization vector for compute().
+        
+        Vectors are cached per suspicion set, so repeated requests with the
+        same suspicious nodes skip the scatter and normalization. The result
+        is shared between calls and must not be modified.
+        
+        Args:
+            graph: SparseGraph the vector is built for
+            node_ids: Node order of the graph's normalized matrix
+            suspicious_nodes: Dict of node_id -> suspicion_score
+            
+        Returns:
+            Personalization vector (probability distribution)
+        """
+        key = (self.dtype, frozenset(suspicious_nodes.items()) if suspicious_nodes else None)
+        cached = self._p_cache.get(key, node_ids)
+        if cached is not None:
+            return cached
+        
+        n = len(node_ids)
+        p = np.zeros(n, dtype=self.dtype)
+        if suspicious_nodes:
+            indices = graph.index_many(suspicious_nodes)
+            scores = np.fromiter(
+                suspicious_nodes.values(), dtype=np.float64, count=len(indices)
+            )
+            known = indices >= 0
+            p[indices[known]] = scores[known]
+        
+        total = p.sum()
+        if total > 0:
+            p /= total
+        else:
+            p.fill(1.0 / n)
+        
+        self._p_cache.put(key, node_ids, p)
+        return p
+    
+    def _iterate_compiled(
+        self,
+        transition: sparse.spmatrix,
+        dangling_mask: NDArray[np.bool_],
+        p: NDArray[np.float64],
+        dangling_vector: NDArray[np.float64],
+        r: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """
+        Run the power iteration through the Numba kernels.
+        
+        Graphs of at most SMALL_GRAPH_NODES nodes use the serial dense
+        kernel, larger ones the parallel CSR kernel.
+        
+        Args:
+            transition: Column-stochastic transition matrix (dangling columns empty)
+            dangling_mask: Boolean array where True indicates a dangling node
+            p: Personalization vector
+            dangling_vector: Distribution for rank leaving dangling nodes
+            r: Initial rank vector
+            
+        Returns:
+            Final rank vector
+        """
+        transition = sparse.csr_matrix(transition, dtype=self.dtype)
+        if transition.shape[0] <= self.SMALL_GRAPH_NODES:
+            kernel = small_ppr_iterate
+            matrix_args = (transition.toarray(),)
+            guard = nullcontext()
+        else:
+            kernel = ppr_iterate
+            matrix_args = (transition.indptr, transition.indices, transition.data)
+            guard = parallel_launch()
+        with guard:
+            r, iterations, converged = kernel(
+                *matrix_args,
+                np.array(r, dtype=self.dtype),
+                np.ascontiguousarray(p, dtype=self.dtype),
+                np.ascontiguousarray(dangling_vector, dtype=self.dtype),
+                np.ascontiguousarray(dangling_mask, dtype=np.bool_),
+                float(self.damping_factor),
+                int(self.max_iterations),
+                float(self.tolerance)
+            )
+        
+        self._converged = bool(converged)
+        self._iterations_performed = int(iterations)
+        self._page_rank = r
+        return r
+    
+    def _use_gpu(self, transition: sparse.spmatrix) -> bool:
+        """Decide whether the configured backend runs this matrix on the GPU."""
+        if self.backend == 'gpu':
+            return True
+        if self.backend == 'auto':
+            return transition.nnz >= self.GPU_MIN_NNZ and gpu_available()
+        return False
+    
+    def _iterate_gpu(
+        self,
+        transition: sparse.spmatrix,
+        dangling_mask: NDArray[np.bool_],
+        p: NDArray[np.float64],
+        dangling_vector: NDArray[np.float64],
+        r: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """
+        Run the power iteration on the GPU through CuPy.
+        
+        Args:
+            transition: Column-stochastic transition matrix (dangling columns empty)
+            dangling_mask: Boolean array where True indicates a dangling node
+            p: Personalization vector
+            dangling_vector: Distribution for rank leaving dangling nodes
+            r: Initial rank vector
+            
+        Returns:
+            Final rank vector (on the host)
+        """
+        r, iterations, converged = gpu_ppr_iterate(
+            sparse.csr_matrix(transition, dtype=self.dtype),
+            np.asarray(r, dtype=self.dtype),
+            np.asarray(p, dtype=self.dtype),
+            np.asarray(dangling_vector, dtype=self.dtype),
+            np.asarray(dangling_mask, dtype=np.bool_),
+            float(self.damping_factor),
+            int(self.max_iterations),
+            float(self.tolerance)
+        )
+        
+        self._converged = bool(converged)
+        self._iterations_performed = int(iterations)
+        self._page_rank = r
+        return r
+    
     def get_top_fraud_candidates(
         self,
         page_rank_scores: Dict[str, float],
@@ -172,28 +506,37 @@ class PowerIterationEngine:
         Returns:
             List of (node_id, page_rank_score, suspicion_score) tuples
         """
-        # Combine scores if suspicion scores provided
+        node_ids = list(page_rank_scores)
+        n = len(node_ids)
+        if n == 0 or top_k <= 0:
+            return []
+        
+        pr_scores = np.fromiter(page_rank_scores.values(), dtype=np.float64, count=n)
         if suspicion_scores:
-            candidates = []
-            for node_id, pr_score in page_rank_scores.items():
-                suspicion = suspicion_scores.get(node_id, 0.0)
-                # Simple weighted combination (can be customized)
-                combined_score = pr_score * (1.0 + suspicion)
-                candidates.append((node_id, pr_score, suspicion, combined_score))
-            
-            # Sort by combined score
-            candidates.sort(key=lambda x: x[3], reverse=True)
+            suspicion = np.fromiter(
+                (suspicion_scores.get(node_id, 0.0) for node_id in node_ids),
+                dtype=np.float64,
+                count=n
+            )
         else:
-            # Sort by PageRank alone
-            candidates = [
-                (node_id, score, 0.0, score)
-                for node_id, score in page_rank_scores.items()
-            ]
-            candidates.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return top k
-        return [(node_id, pr_score, suspicion) 
-                for node_id, pr_score, suspicion, _ in candidates[:top_k]]
+            suspicion = np.zeros(n)
+        
+        # Simple weighted combination (can be customized); without suspicion
+        # scores this is the PageRank score itself
+        combined_score = pr_scores * (1.0 + suspicion)
+        
+        # Find the k-th best score in O(n), then sort only the nodes at or
+        # above it. They are taken in node order, so the stable sort breaks
+        # ties by node order, as a stable sort of all n scores would
+        if top_k < n:
+            kth = np.argpartition(-combined_score, top_k - 1)[top_k - 1]
+            top_idx = np.flatnonzero(combined_score >= combined_score[kth])
+        else:
+            top_idx = np.arange(n)
+        top_idx = top_idx[np.argsort(-combined_score[top_idx], kind='stable')][:top_k]
+        
+        return [(node_ids[i], float(pr_scores[i]), float(suspicion[i]))
+                for i in top_idx]
     
     def get_convergence_info(self) -> Dict[str, any]:
         """
@@ -220,7 +563,7 @@ class PowerIterationEngine:
         base_weights: Optional[Dict[str, float]] = None
     ) -> Dict[str, float]:
         """
-        Optimized PageRank computation for sparse graphs.
+        PageRank for a sparse adjacency matrix; see compute_page_rank.
         
         Args:
             node_ids: List of node identifiers
@@ -232,81 +575,64 @@ class PowerIterationEngine:
         Returns:
             Dictionary mapping node_id to PageRank score
         """
-        n = len(node_ids)
-        
-        if weights is not None:
-            # Element-wise multiplication for sparse matrices
-            weighted_adj = sparse_adjacency.multiply(weights)
-        else:
-            weighted_adj = sparse_adjacency.astype(np.float64)
+        return self.compute_page_rank(
+            node_ids, sparse_adjacency, suspicious_nodes, base_weights, weights
+        )
+
+    def compute_neumann_page_rank(
+        self,
+        node_ids: List[str],
+        sparse_adjacency: sparse.spmatrix,
+        weights: Optional[sparse.spmatrix] = None,
+        suspicious_nodes: Optional[Dict[str, float]] = None,
+        base_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """
+        PageRank as a truncated Neumann series instead of power iteration.
         
-        # Convert to CSC format for efficient column operations
-        weighted_adj_csc = weighted_adj.tocsc()
+        Accumulates r = α * Σ_k ((1 - α) * G)^k p term by term, where G is the
+        transition matrix with dangling rank redistributed by the dangling
+        strategy. Every term has
+        L1 mass α * (1 - α)^k, so the truncation error is known exactly and no
+        difference vector is formed per step.
         
-        # Compute out-degree (sum of each column)
-        out_degree = np.array(weighted_adj_csc.sum(axis=0)).flatten()
-        dangling_mask = out_degree == 0
+        Args:
+            node_ids: List of node identifiers
+            sparse_adjacency: Sparse adjacency matrix (CSR format recommended)
+            weights: Optional sparse weight matrix
+            suspicious_nodes: Suspicion scores for fraud detection
+            base_weights: Base importance weights
+            
+        Returns:
+            Dictionary mapping node_id to PageRank score
+        """
+        if not node_ids:
+            return self._empty_page_rank()
         
-        # Create personalization vector
+        transition = self.build_transition_matrix(sparse_adjacency, weights)
+        dangling_mask = self._dangling_mask
         p = self.compute_personalization_vector(node_ids, suspicious_nodes, base_weights)
+        p = p.astype(self.dtype, copy=False)
+        dangling_vector = self._dangling_vector(transition, dangling_mask, p)
         
-        # Initialize rank vector
-        r = np.ones(n) / n
+        # Fold (1 - α) into the matrix once; each term is then one SpMV
+        scaled_matrix = (1 - self.damping_factor) * transition
+        follow = 1 - self.damping_factor
+        
+        term = self.damping_factor * p
+        r = term.copy()
         
-        # Handle dangling nodes according to strategy
-        # For sparse implementation, we handle this during iteration
-        dangling_teleport = np.zeros(n)
-        if np.any(dangling_mask):
-            # Get dangling node indices
-            dangling_indices = np.where(dangling_mask)[0]
-            
-            # Apply dangling strategy
-            if hasattr(self.dangling_strategy, 'handle_dangling_nodes'):
-                # For sparse, we need a different approach
-                # Create a dense representation of dangling columns
-                dummy_matrix = np.eye(n)[:, dangling_indices]
-                handled = self.dangling_strategy.handle_dangling_nodes(
-                    dummy_matrix, np.ones(len(dangling_indices), dtype=bool)
-                )
-                # For simplicity in sparse version, we'll teleport from dangling nodes
-                # according to personalization vector
-                dangling_teleport = p.copy()
-            else:
-                # Default: teleport uniformly
-                dangling_teleport = np.ones(n) / n
-        
-        # Power iteration for sparse matrices
         for iteration in range(self.max_iterations):
-            r_prev = r.copy()
-            
-            # Multiply r_prev by M (sparse matrix multiplication)
-            # M = normalized weighted_adj + dangling adjustments
-            rM = np.zeros(n)
-            
-            # Handle non-dangling columns
-            non_dangling = out_degree > 0
-            if np.any(non_dangling):
-                # Normalize columns and multiply
-                for j in np.where(non_dangling)[0]:
-                    col = weighted_adj_csc[:, j].toarray().flatten()
-                    rM += r_prev[j] * (col / out_degree[j])
-            
-            # Handle dangling columns
-            if np.any(dangling_mask):
-                for j in np.where(dangling_mask)[0]:
-                    rM += r_prev[j] * dangling_teleport
-            
-            # Apply damping factor
-            r = (1 - self.damping_factor) * rM + self.damping_factor * p
-            
-            # Check convergence
-            diff = np.linalg.norm(r - r_prev, ord=1)
+            dangling_sum = np.sum(term[dangling_mask])
+            term = scaled_matrix @ term
+            term += (follow * dangling_sum) * dangling_vector
+            r += term
             
-            if diff < self.tolerance:
+            # Terms are non-negative, so the sum is the L1 norm of the term
+            if np.sum(term) < self.tolerance:
                 self._converged = True
                 self._iterations_performed = iteration + 1
                 break
-        
         else:
             self._converged = False
             self._iterations_performed = self.max_iterations
@@ -314,6 +640,87 @@ class PowerIterationEngine:
         self._page_rank = r
         
         return {node_id: float(score) for node_id, score in zip(node_ids, r)}
+    
+    def compute_gauss_seidel_page_rank(
+        self,
+        node_ids: List[str],
+        sparse_adjacency: sparse.spmatrix,
+        weights: Optional[sparse.spmatrix] = None,
+        suspicious_nodes: Optional[Dict[str, float]] = None,
+        base_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """
+        PageRank via Gauss–Seidel on the equivalent sparse linear system.
+        
+        Following Del Corso, Gulli and Romani, the rank vector is proportional
+        to the solution of (I - (1 - α) M) x = α p, where M keeps dangling
+        columns empty; normalizing x to unit L1 mass recovers the PageRank
+        with dangling rank redirected to p. When the dangling strategy
+        redistributes along another vector v, a second solve with v on the
+        right-hand side gives r = x + s * y, with the scalar s fixed by the
+        rank the dangling nodes hold. Gauss–Seidel typically needs
+        fewer sweeps than power iteration, but the gain depends on the graph
+        and node ordering, so this is offered as an alternative solver.
+        
+        Args:
+            node_ids: List of node identifiers
+            sparse_adjacency: Sparse adjacency matrix (CSR format recommended)
+            weights: Optional sparse weight matrix
+            suspicious_nodes: Suspicion scores for fraud detection
+            base_weights: Base importance weights
+            
+        Returns:
+            Dictionary mapping node_id to PageRank score
+        """
+        if not node_ids:
+            return self._empty_page_rank()
+        
+        transition = self.build_transition_matrix(sparse_adjacency, weights)
+        dangling_mask = self._dangling_mask
+        p = self.compute_personalization_vector(node_ids, suspicious_nodes, base_weights)
+        p = np.ascontiguousarray(p, dtype=self.dtype)
+        dangling_vector = self._dangling_vector(transition, dangling_mask, p)
+        follow = 1 - self.damping_factor
+        
+        x, sweeps, converged = self._gauss_seidel(transition, self.damping_factor * p)
+        
+        if np.array_equal(dangling_vector, p):
+            r = x / np.sum(x)
+        else:
+            # r = x + s * y solves r = α p + (1 - α) (M r + (d · r) v), with
+            # y the response to v and d · r = d · x + s * d · y
+            y, extra_sweeps, y_converged = self._gauss_seidel(
+                transition, np.ascontiguousarray(dangling_vector)
+            )
+            sweeps += extra_sweeps
+            converged = converged and y_converged
+            s = follow * np.sum(x[dangling_mask]) / (1 - follow * np.sum(y[dangling_mask]))
+            r = x + s * y
+            r /= np.sum(r)
+        
+        self._converged = bool(converged)
+        self._iterations_performed = int(sweeps)
+        self._page_rank = r
+        
+        return {node_id: float(score) for node_id, score in zip(node_ids, r)}
+    
+    def _gauss_seidel(
+        self,
+        transition: sparse.csr_matrix,
+        b: NDArray[np.float64]
+    ) -> Tuple[NDArray[np.float64], int, bool]:
+        """Solve (I - (1 - α) M) x = b with Gauss–Seidel, starting from b."""
+        return gauss_seidel_solve(
+            transition.indptr,
+            transition.indices,
+            transition.data,
+            b.copy(),
+            b,
+            float(1 - self.damping_factor),
+            int(self.max_iterations),
+            float(self.tolerance)
+        )
+    
     def evaluate_accuracy(self, pagerank_results, ground_truth):
         hits = 0
         sorted_nodes = sorted(pagerank_results.items(), key=lambda x: x[1], reverse=True)
@@ -4,9 +4,10 @@ Defines interfaces for dangling node handling and personalization vectors.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 from numpy.typing import NDArray
+from scipy import sparse
 
 
 class BaseDanglingNodeStrategy(ABC):
@@ -33,6 +34,46 @@ class BaseDanglingNodeStrategy(ABC):
         """
         pass
     
+    def as_operator(
+        self,
+        transition_matrix: Union[NDArray[np.float64], sparse.spmatrix],
+        dangling_mask: NDArray[np.bool_],
+        personalization: Optional[NDArray[np.float64]] = None
+    ) -> Tuple[sparse.csr_matrix, NDArray[np.bool_], NDArray[np.float64]]:
+        """
+        Describe the dangling node handling as a rank-1 update.
+        
+        Nothing is materialized: the result is (csr, dangling_mask, v), and
+        the solver applies M @ r + v * r[dangling_mask].sum() per step. This
+        is the form PowerIterationEngine uses, since filling dangling
+        columns makes them dense.
+        
+        The default reads v from a dangling column of the dense
+        handle_dangling_nodes result, so strategies that only implement
+        handle_dangling_nodes keep working; it assumes every dangling column
+        is filled with the same distribution. The built-in strategies
+        override it to build v without densifying the matrix.
+        
+        Args:
+            transition_matrix: The original transition matrix (n x n)
+            dangling_mask: Boolean array where True indicates a dangling node
+            personalization: Personalization vector of the current run
+            
+        Returns:
+            Tuple of (csr_matrix, dangling_mask, dangling_vector)
+        """
+        n = transition_matrix.shape[0]
+        csr = sparse.csr_matrix(transition_matrix)
+        dangling = np.flatnonzero(dangling_mask)
+        if dangling.size == 0:
+            # Without dangling nodes v is never applied
+            return csr, dangling_mask, np.zeros(n)
+        
+        if sparse.issparse(transition_matrix):
+            transition_matrix = transition_matrix.toarray()
+        adjusted = self.handle_dangling_nodes(np.asarray(transition_matrix), dangling_mask)
+        return csr, dangling_mask, np.asarray(adjusted[:, dangling[0]], dtype=np.float64)
+    
     @abstractmethod
     def get_description(self) -> str:
         """Returns a human-readable description of the strategy."""
@@ -71,6 +112,29 @@ class BasePersonalizationStrategy(ABC):
         pass
 
 
+def _known_entries(
+    node_to_idx: Dict[str, int],
+    values: Dict[str, float]
+) -> Tuple[NDArray[np.int64], NDArray[np.float64]]:
+    """
+    Look up the indices and values of a node-keyed dict in one pass.
+    
+    Args:
+        node_to_idx: Mapping from node_id to vector index
+        values: Dict mapping node_id to a value
+        
+    Returns:
+        Tuple of (indices, values) for the node ids present in node_to_idx
+    """
+    lookup = node_to_idx.get
+    indices = np.fromiter(
+        (lookup(node_id, -1) for node_id in values), dtype=np.int64, count=len(values)
+    )
+    scores = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+    known = indices >= 0
+    return indices[known], scores[known]
+
+
 # Concrete implementations for common strategies
 
 class UniformDanglingStrategy(BaseDanglingNodeStrategy):
@@ -84,14 +148,31 @@ class UniformDanglingStrategy(BaseDanglingNodeStrategy):
         transition_matrix: NDArray[np.float64],
         dangling_mask: NDArray[np.bool_]
     ) -> NDArray[np.float64]:
-        n = transition_matrix.shape[0]
-        adjusted_matrix = transition_matrix.copy()
+        """
+        Set the dangling columns of a column-stochastic matrix to 1/n.
         
-        # For each dangling node, distribute its probability mass uniformly
-        for i in np.where(dangling_mask)[0]:
-            adjusted_matrix[i, :] = 1.0 / n
+        Args:
+            transition_matrix: The original transition matrix (n x n)
+            dangling_mask: Boolean array where True indicates a dangling node
             
-        return adjusted_matrix
+        Returns:
+            Adjusted transition matrix with dangling node handling
+        """
+        n = transition_matrix.shape[0]
+        
+        # One pass that copies the matrix and fills the dangling columns
+        return np.where(dangling_mask[np.newaxis, :], 1.0 / n, transition_matrix)
+    
+    def as_operator(
+        self,
+        transition_matrix: Union[NDArray[np.float64], sparse.spmatrix],
+        dangling_mask: NDArray[np.bool_],
+        personalization: Optional[NDArray[np.float64]] = None
+    ) -> Tuple[sparse.csr_matrix, NDArray[np.bool_], NDArray[np.float64]]:
+        """Rank-1 form of the uniform redistribution: v = 1/n everywhere."""
+        n = transition_matrix.shape[0]
+        dangling_vector = np.full(n, 1.0 / n) if n else np.zeros(0)
+        return sparse.csr_matrix(transition_matrix), dangling_mask, dangling_vector
     
     def get_description(self) -> str:
         return "Uniform redistribution of dangling node rank to all nodes"
@@ -111,20 +192,54 @@ class TeleportDanglingStrategy(BaseDanglingNodeStrategy):
         transition_matrix: NDArray[np.float64],
         dangling_mask: NDArray[np.bool_]
     ) -> NDArray[np.float64]:
-        n = transition_matrix.shape[0]
-        adjusted_matrix = transition_matrix.copy()
-        
-        if self.personalization_vector is None:
-            # Fallback to uniform if no personalization vector provided
-            personalization = np.ones(n) / n
-        else:
-            personalization = self.personalization_vector
+        """
+        Set the dangling columns to the personalization vector.
         
-        # Redirect dangling nodes according to personalization
-        for i in np.where(dangling_mask)[0]:
-            adjusted_matrix[i, :] = personalization
+        Args:
+            transition_matrix: The original transition matrix (n x n)
+            dangling_mask: Boolean array where True indicates a dangling node
             
-        return adjusted_matrix
+        Returns:
+            Adjusted transition matrix with dangling node handling
+        """
+        personalization = self._dangling_vector(transition_matrix.shape[0], None)
+        
+        # One pass that copies the matrix and fills the dangling columns
+        return np.where(
+            dangling_mask[np.newaxis, :], personalization[:, np.newaxis], transition_matrix
+        )
+    
+    def as_operator(
+        self,
+        transition_matrix: Union[NDArray[np.float64], sparse.spmatrix],
+        dangling_mask: NDArray[np.bool_],
+        personalization: Optional[NDArray[np.float64]] = None
+    ) -> Tuple[sparse.csr_matrix, NDArray[np.bool_], NDArray[np.float64]]:
+        """
+        Rank-1 form of the redirection: v is the personalization vector.
+        
+        Without a vector given at construction, dangling rank follows the
+        personalization vector of the current run.
+        """
+        n = transition_matrix.shape[0]
+        return (
+            sparse.csr_matrix(transition_matrix),
+            dangling_mask,
+            self._dangling_vector(n, personalization)
+        )
+    
+    def _dangling_vector(
+        self,
+        n: int,
+        personalization: Optional[NDArray[np.float64]]
+    ) -> NDArray[np.float64]:
+        """Distribution for rank leaving dangling nodes."""
+        if self.personalization_vector is not None:
+            return np.asarray(self.personalization_vector, dtype=np.float64)
+        if personalization is not None:
+            return np.asarray(personalization, dtype=np.float64)
+        # Fallback to uniform if no personalization vector provided
+        return np.ones(n) / n
     
     def get_description(self) -> str:
         return "Redirect dangling nodes according to personalization vector"
@@ -139,9 +254,8 @@ class SuspicionBasedPersonalization(BasePersonalizationStrategy):
         if not suspicious_nodes:
             return np.ones(n) / n
             
-        for node_id, score in suspicious_nodes.items():
-            if node_id in node_to_idx:
-                p[node_to_idx[node_id]] = score
+        indices, scores = _known_entries(node_to_idx, suspicious_nodes)
+        p[indices] = scores
                 
         total = np.sum(p)
         if total > 0:
@@ -178,20 +292,15 @@ class TransactionVolumePersonalization(BasePersonalizationStrategy):
         personalization = np.zeros(n)
         
         # Apply base weights (transaction volumes)
-        total_weight = 0.0
-        for node_id, weight in base_weights.items():
-            if node_id in node_to_idx:
-                idx = node_to_idx[node_id]
-                personalization[idx] = weight
-                total_weight += weight
+        indices, weights = _known_entries(node_to_idx, base_weights)
+        personalization[indices] = weights
+        total_weight = weights.sum()
         
         # Apply suspicion boost if provided
         if suspicious_nodes:
-            for node_id, suspicion_score in suspicious_nodes.items():
-                if node_id in node_to_idx:
-                    idx = node_to_idx[node_id]
-                    # Add suspicion as additional weight
-                    personalization[idx] += suspicion_score * total_weight / n
+            indices, suspicion_scores = _known_entries(node_to_idx, suspicious_nodes)
+            # Add suspicion as additional weight
+            personalization[indices] += suspicion_scores * (total_weight / n)
         
         # Normalize if we have any weights
         total = np.sum(personalization)
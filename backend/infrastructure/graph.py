@@ -1,19 +1,60 @@
 """
-Graph infrastructure layer implementing sparse adjacency list representation.
+Graph infrastructure layer implementing a CSR-backed sparse graph representation.
 """
 
-from typing import Dict, List, Tuple, Optional, Set
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple, Optional, Set
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import DTypeLike, NDArray
 from scipy import sparse
 
 
+def _build_csr(
+    rows: NDArray[np.int64],
+    cols: NDArray[np.int64],
+    weights: NDArray[np.float64],
+    n: int
+) -> Tuple[NDArray[np.int64], NDArray[np.int32], NDArray[np.float64]]:
+    """
+    Assemble CSR arrays from COO edges, keeping the last duplicate.
+    
+    Args:
+        rows: Source node indices
+        cols: Target node indices
+        weights: Edge weights
+        n: Number of nodes
+        
+    Returns:
+        Tuple of (indptr, indices, data) with sorted column indices per row
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+    
+    # np.unique sorts the keys, so the kept edges come out in row-major
+    # order; searching the reversed keys picks the last occurrence
+    keys = rows * n + cols
+    _, last_in_reversed = np.unique(keys[::-1], return_index=True)
+    keep = len(keys) - 1 - last_in_reversed
+    
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[keep], minlength=n), out=indptr[1:])
+    return indptr, cols[keep].astype(np.int32), weights[keep]
+
+
 class SparseGraph:
     """
-    Sparse graph implementation using adjacency lists with optional edge weights.
+    Sparse graph stored as CSR arrays with optional edge weights.
     Supports directed and undirected graphs.
+    
+    Nodes are mapped to integer indices in insertion order; edges live in
+    indptr/indices/data arrays. add_edge appends to growable edge buffers
+    that are merged into the CSR arrays the next time the graph is read.
     """
     
+    # Initial capacity of the edge buffers; they double when full
+    _INITIAL_BUFFER_SIZE = 16
+    
     def __init__(self, directed: bool = True):
         """
         Initialize an empty graph.
@@ -22,23 +63,42 @@ class SparseGraph:
             directed: Whether the graph is directed (default: True)
         """
         self.directed = directed
-        self._adjacency_list: Dict[str, Dict[str, float]] = {}
         self._node_to_idx: Dict[str, int] = {}
         self._idx_to_node: Dict[int, str] = {}
-        self._edge_count: int = 0
+        
+        # CSR edge storage (row = source)
+        self._indptr: NDArray[np.int64] = np.zeros(1, dtype=np.int64)
+        self._indices: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+        self._data: NDArray[np.float64] = np.zeros(0, dtype=np.float64)
+        
+        # Edges added since the last _finalize()
+        self._src_buf = np.empty(self._INITIAL_BUFFER_SIZE, dtype=np.int32)
+        self._dst_buf = np.empty(self._INITIAL_BUFFER_SIZE, dtype=np.int32)
+        self._w_buf = np.empty(self._INITIAL_BUFFER_SIZE, dtype=np.float64)
+        self._pending: int = 0
+        
+        # Read methods merge the buffers lazily, and the API reads a graph
+        # from several threads, so only one of them may run the merge
+        self._finalize_lock = threading.Lock()
+        
+        # Bumped on every mutation; derived matrices are cached per version
+        self._version: int = 0
+        self._caches: Dict[Hashable, Tuple[int, Any]] = {}
         
     def add_node(self, node_id: str) -> None:
         """Add a node to the graph if it doesn't exist."""
-        if node_id not in self._adjacency_list:
-            idx = len(self._adjacency_list)
-            self._adjacency_list[node_id] = {}
+        if node_id not in self._node_to_idx:
+            idx = len(self._node_to_idx)
             self._node_to_idx[node_id] = idx
             self._idx_to_node[idx] = node_id
+            self._version += 1
     
     def add_edge(self, source: str, target: str, weight: float = 1.0) -> None:
         """
         Add an edge between source and target nodes.
         
+        Adding an existing edge again overwrites its weight.
+        
         Args:
             source: Source node identifier
             target: Target node identifier
@@ -48,16 +108,137 @@ class SparseGraph:
         self.add_node(source)
         self.add_node(target)
         
-        # Add edge from source to target
-        if target not in self._adjacency_list[source]:
-            self._edge_count += 1
-        self._adjacency_list[source][target] = weight
+        self._version += 1
+        
+        u = self._node_to_idx[source]
+        v = self._node_to_idx[target]
+        self._append_edge(u, v, weight)
         
         # If undirected, add reverse edge
         if not self.directed and source != target:
-            if source not in self._adjacency_list[target]:
-                self._edge_count += 1
-            self._adjacency_list[target][source] = weight
+            self._append_edge(v, u, weight)
+    
+    def add_edges_from(self, edges: Iterable[Tuple]) -> None:
+        """
+        Add many edges at once.
+        
+        Equivalent to calling add_edge for each edge in order, but the node
+        lookups run in one loop and the edges are copied into the buffers
+        as arrays.
+        
+        Args:
+            edges: Iterable of (source, target) or (source, target, weight)
+                tuples; the weight defaults to 1.0
+        """
+        add_node = self.add_node
+        node_to_idx = self._node_to_idx
+        rows, cols, weights = [], [], []
+        for edge in edges:
+            source, target = edge[0], edge[1]
+            add_node(source)
+            add_node(target)
+            rows.append(node_to_idx[source])
+            cols.append(node_to_idx[target])
+            weights.append(edge[2] if len(edge) > 2 else 1.0)
+        
+        if not rows:
+            return
+        self._version += 1
+        
+        rows = np.array(rows, dtype=np.int32)
+        cols = np.array(cols, dtype=np.int32)
+        weights = np.array(weights, dtype=np.float64)
+        
+        if not self.directed:
+            # Each edge is followed by its reverse, as add_edge does; the
+            # reverse of a self-loop is the same entry and is dropped
+            reverse = rows != cols
+            rows, cols, weights = (
+                np.column_stack((rows, cols)).ravel(),
+                np.column_stack((cols, rows)).ravel(),
+                np.repeat(weights, 2)
+            )
+            keep = np.column_stack((np.ones_like(reverse), reverse)).ravel()
+            rows, cols, weights = rows[keep], cols[keep], weights[keep]
+        
+        self._reserve(len(rows))
+        end = self._pending + len(rows)
+        self._src_buf[self._pending:end] = rows
+        self._dst_buf[self._pending:end] = cols
+        self._w_buf[self._pending:end] = weights
+        self._pending = end
+    
+    def _reserve(self, count: int) -> None:
+        """Grow the edge buffers geometrically to fit count more edges."""
+        needed = self._pending + count
+        capacity = self._src_buf.shape[0]
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            self._src_buf = np.resize(self._src_buf, capacity)
+            self._dst_buf = np.resize(self._dst_buf, capacity)
+            self._w_buf = np.resize(self._w_buf, capacity)
+    
+    def _append_edge(self, u: int, v: int, weight: float) -> None:
+        """Append one edge to the buffers, growing them geometrically."""
+        self._reserve(1)
+        
+        self._src_buf[self._pending] = u
+        self._dst_buf[self._pending] = v
+        self._w_buf[self._pending] = weight
+        self._pending += 1
+    
+    def _finalize(self) -> None:
+        """
+        Merge buffered edges and newly added nodes into the CSR arrays.
+        
+        Safe to call from concurrent readers: the merge runs under a lock,
+        and _pending is only reset once the new arrays are in place, so a
+        reader that sees nothing pending also sees the merged arrays.
+        """
+        if self._pending == 0 and self._indptr.shape[0] - 1 == len(self._node_to_idx):
+            return
+        
+        with self._finalize_lock:
+            n = len(self._node_to_idx)
+            old_n = self._indptr.shape[0] - 1
+            
+            if self._pending == 0:
+                if old_n < n:
+                    # New isolated nodes only need empty rows
+                    self._indptr = np.concatenate(
+                        (self._indptr, np.full(n - old_n, self._indptr[-1]))
+                    )
+                return
+            
+            count = self._pending
+            self._indptr, self._indices, self._data = _build_csr(
+                np.concatenate((self._row_indices(), self._src_buf[:count])),
+                np.concatenate((self._indices, self._dst_buf[:count])),
+                np.concatenate((self._data, self._w_buf[:count])),
+                n
+            )
+            self._pending = 0
+    
+    def _row_indices(self) -> NDArray[np.int64]:
+        """Source index of every stored CSR entry."""
+        return np.repeat(
+            np.arange(self._indptr.shape[0] - 1, dtype=np.int64),
+            np.diff(self._indptr)
+        )
+    
+    def _delete_edge(self, u: int, v: int) -> bool:
+        """Delete the stored edge u -> v from the CSR arrays, if present."""
+        start, end = self._indptr[u], self._indptr[u + 1]
+        position = start + np.searchsorted(self._indices[start:end], v)
+        if position == end or self._indices[position] != v:
+            return False
+        
+        self._indices = np.delete(self._indices, position)
+        self._data = np.delete(self._data, position)
+        self._indptr = self._indptr.copy()
+        self._indptr[u + 1:] -= 1
+        return True
     
     def remove_edge(self, source: str, target: str) -> bool:
         """
@@ -66,49 +247,130 @@ class SparseGraph:
         Returns:
             True if edge was removed, False if it didn't exist
         """
-        if source in self._adjacency_list and target in self._adjacency_list[source]:
-            del self._adjacency_list[source][target]
-            self._edge_count -= 1
-            
-            # If undirected, remove reverse edge
-            if not self.directed and source != target:
-                del self._adjacency_list[target][source]
-                self._edge_count -= 1
-            
-            return True
-        return False
+        if source not in self._node_to_idx or target not in self._node_to_idx:
+            return False
+        
+        self._finalize()
+        u = self._node_to_idx[source]
+        v = self._node_to_idx[target]
+        if not self._delete_edge(u, v):
+            return False
+        
+        # If undirected, remove reverse edge
+        if not self.directed and source != target:
+            self._delete_edge(v, u)
+        
+        self._version += 1
+        return True
+    
+    def _cached(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Return the value cached under key, rebuilding it if the graph changed.
+        
+        Cached results are shared between callers and must not be modified.
+        """
+        entry = self._caches.get(key)
+        if entry is None or entry[0] != self._version:
+            entry = (self._version, build())
+            self._caches[key] = entry
+        return entry[1]
+    
+    def _row(self, node_id: str) -> Tuple[NDArray[np.int32], NDArray[np.float64]]:
+        """Target indices and weights of a node's out-edges."""
+        self._finalize()
+        u = self._node_to_idx.get(node_id)
+        if u is None:
+            return self._indices[:0], self._data[:0]
+        start, end = self._indptr[u], self._indptr[u + 1]
+        return self._indices[start:end], self._data[start:end]
     
     def get_neighbors(self, node_id: str) -> Dict[str, float]:
         """Get all neighbors of a node with edge weights."""
-        return self._adjacency_list.get(node_id, {}).copy()
+        targets, weights = self._row(node_id)
+        return {
+            self._idx_to_node[v]: weight
+            for v, weight in zip(targets.tolist(), weights.tolist())
+        }
+    
+    def index_many(self, node_ids: Iterable[str]) -> NDArray[np.int64]:
+        """
+        Map node identifiers to their matrix indices in one pass.
+        
+        Args:
+            node_ids: Node identifiers to look up
+            
+        Returns:
+            Array of indices, with -1 for identifiers not in the graph
+        """
+        lookup = self._node_to_idx.get
+        return np.fromiter(
+            (lookup(node_id, -1) for node_id in node_ids), dtype=np.int64
+        )
     
     def get_out_degree(self, node_id: str) -> float:
         """Get the total out-degree (sum of edge weights) of a node."""
-        neighbors = self._adjacency_list.get(node_id, {})
-        return sum(neighbors.values())
+        _, weights = self._row(node_id)
+        return float(weights.sum())
     
     def get_in_degree(self, node_id: str) -> float:
         """Get the total in-degree of a node (sum of incoming edge weights)."""
         if not self.directed:
             return self.get_out_degree(node_id)
         
-        total = 0.0
-        for source, neighbors in self._adjacency_list.items():
-            if node_id in neighbors:
-                total += neighbors[node_id]
-        return total
+        v = self._node_to_idx.get(node_id)
+        if v is None:
+            return 0.0
+        return float(self.get_all_in_degrees()[v])
+    
+    def get_all_out_degrees(self) -> NDArray[np.float64]:
+        """
+        Get the out-degree (sum of edge weights) of every node, in index order.
+        
+        The result is cached until the graph is next mutated.
+        """
+        def build():
+            self._finalize()
+            return np.bincount(
+                self._row_indices(), weights=self._data, minlength=len(self)
+            )
+        return self._cached('out_degrees', build)
+    
+    def get_all_in_degrees(self) -> NDArray[np.float64]:
+        """
+        Get the in-degree (sum of incoming edge weights) of every node.
+        
+        Computed in one pass over the edges and cached until the graph is
+        next mutated, so per-node lookups are O(1) afterwards.
+        """
+        def build():
+            self._finalize()
+            return np.bincount(self._indices, weights=self._data, minlength=len(self))
+        return self._cached('in_degrees', build)
+    
+    def get_edge_count(self) -> int:
+        """Get the number of stored edges (both directions for undirected graphs)."""
+        self._finalize()
+        return int(self._indices.shape[0])
     
     def get_nodes(self) -> List[str]:
         """Get all node identifiers in the graph."""
-        return list(self._adjacency_list.keys())
+        return list(self._node_to_idx)
+    
+    def _node_id_array(self) -> NDArray[np.object_]:
+        """Node identifiers as an object array, for fancy indexing."""
+        ids = np.empty(len(self._node_to_idx), dtype=object)
+        ids[:] = self.get_nodes()
+        return ids
     
     def get_edges(self) -> List[Tuple[str, str, float]]:
         """Get all edges as (source, target, weight) tuples."""
-        edges = []
-        for source, neighbors in self._adjacency_list.items():
-            for target, weight in neighbors.items():
-                edges.append((source, target, weight))
-        return edges
+        self._finalize()
+        ids = self._node_id_array()
+        return list(zip(
+            ids[self._row_indices()].tolist(),
+            ids[self._indices].tolist(),
+            self._data.tolist()
+        ))
     
     def get_adjacency_matrix(self) -> Tuple[NDArray[np.float64], List[str]]:
         """
@@ -117,47 +379,42 @@ class SparseGraph:
         Returns:
             Tuple of (adjacency_matrix, node_ids)
         """
-        node_ids = self.get_nodes()
-        n = len(node_ids)
-        
-        matrix = np.zeros((n, n), dtype=np.float64)
-        
-        for i, source in enumerate(node_ids):
-            neighbors = self._adjacency_list[source]
-            for target, weight in neighbors.items():
-                j = self._node_to_idx[target]
-                matrix[i, j] = weight
-        
-        return matrix, node_ids
+        matrix, node_ids = self.get_sparse_adjacency_matrix()
+        return matrix.toarray(), node_ids
     
-    def get_sparse_adjacency_matrix(self) -> Tuple[sparse.csr_matrix, List[str]]:
+    def get_sparse_adjacency_matrix(
+        self,
+        dtype: DTypeLike = np.float64
+    ) -> Tuple[sparse.csr_matrix, List[str]]:
         """
         Get sparse CSR adjacency matrix representation.
         
+        The result is cached per dtype until the graph is next mutated.
+        
+        Args:
+            dtype: Type of the matrix values; np.float32 halves the size
+                of the data array
+            
         Returns:
             Tuple of (sparse_matrix, node_ids)
         """
-        node_ids = self.get_nodes()
-        n = len(node_ids)
-        
-        # Build data, row, and column arrays for COO format
-        data = []
-        rows = []
-        cols = []
-        
-        for i, source in enumerate(node_ids):
-            neighbors = self._adjacency_list[source]
-            for target, weight in neighbors.items():
-                j = self._node_to_idx[target]
-                data.append(weight)
-                rows.append(i)
-                cols.append(j)
-        
-        # Create COO matrix and convert to CSR
-        coo_matrix = sparse.coo_matrix((data, (rows, cols)), shape=(n, n))
-        csr_matrix = coo_matrix.tocsr()
-        
-        return csr_matrix, node_ids
+        dtype = np.dtype(dtype)
+        return self._cached(
+            ('adjacency', dtype), lambda: self._build_sparse_adjacency_matrix(dtype)
+        )
+    
+    def _build_sparse_adjacency_matrix(
+        self,
+        dtype: np.dtype
+    ) -> Tuple[sparse.csr_matrix, List[str]]:
+        """Wrap the CSR storage (row = source) in a scipy matrix."""
+        self._finalize()
+        n = len(self._node_to_idx)
+        csr_matrix = sparse.csr_matrix(
+            (self._data.astype(dtype, copy=False), self._indices, self._indptr),
+            shape=(n, n)
+        )
+        return csr_matrix, self.get_nodes()
     
     def subgraph(self, nodes: Set[str]) -> 'SparseGraph':
         """
@@ -172,33 +429,128 @@ class SparseGraph:
         subgraph = SparseGraph(directed=self.directed)
         
         # Add nodes
-        for node in nodes:
-            if node in self._adjacency_list:
-                subgraph.add_node(node)
+        kept = [node for node in nodes if node in self._node_to_idx]
+        for node in kept:
+            subgraph.add_node(node)
         
-        # Add edges between included nodes
-        for source in nodes:
-            if source in self._adjacency_list:
-                for target, weight in self._adjacency_list[source].items():
-                    if target in nodes:
-                        subgraph.add_edge(source, target, weight)
+        # Keep the edges whose endpoints both map into the subgraph
+        self._finalize()
+        new_index = np.full(len(self._node_to_idx), -1, dtype=np.int64)
+        new_index[self.index_many(kept)] = np.arange(len(kept))
+        rows = new_index[self._row_indices()]
+        cols = new_index[self._indices]
+        inside = (rows >= 0) & (cols >= 0)
+        subgraph._indptr, subgraph._indices, subgraph._data = _build_csr(
+            rows[inside], cols[inside], self._data[inside], len(kept)
+        )
         
         return subgraph
     
-    def save_to_file(self, filepath: str) -> None:
-        """Save graph to text file."""
-        with open(filepath, 'w') as f:
-            f.write(f"directed:{self.directed}\n")
-            f.write(f"nodes:{len(self._adjacency_list)}\n")
-            f.write(f"edges:{self._edge_count}\n")
+    @classmethod
+    def from_coo(
+        cls,
+        rows: NDArray[np.int64],
+        cols: NDArray[np.int64],
+        weights: NDArray[np.float64],
+        node_ids: List[str],
+        directed: bool = True
+    ) -> 'SparseGraph':
+        """
+        Build a graph in bulk from COO edge arrays.
+        
+        Edges are deduplicated and assembled into the CSR storage in one
+        vectorized pass. As with repeated add_edge calls, a later duplicate
+        edge overwrites the weight of an earlier one.
+        
+        Args:
+            rows: Source node indices into node_ids
+            cols: Target node indices into node_ids
+            weights: Edge weights
+            node_ids: Node identifiers in index order
+            directed: Whether the graph is directed (default: True)
             
-            for source, neighbors in self._adjacency_list.items():
-                for target, weight in neighbors.items():
-                    f.write(f"{source},{target},{weight}\n")
+        Returns:
+            New SparseGraph containing the given nodes and edges
+        """
+        graph = cls(directed=directed)
+        
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        
+        if not directed:
+            # Each edge is followed by its reverse, as add_edge does
+            rows, cols = (np.column_stack((rows, cols)).ravel(),
+                          np.column_stack((cols, rows)).ravel())
+            weights = np.repeat(weights, 2)
+        
+        for node_id in node_ids:
+            graph.add_node(node_id)
+        
+        graph._indptr, graph._indices, graph._data = _build_csr(
+            rows, cols, weights, len(node_ids)
+        )
+        graph._version += 1
+        
+        return graph
+    
+    def save_to_file(self, filepath: str) -> None:
+        """
+        Save graph to a binary .npz file.
+        
+        The CSR arrays are written as stored, together with the node ids
+        (as strings, matching what the text format round-tripped) and the
+        directed flag. The file is uncompressed so that loading is a plain
+        read of each array.
+        
+        Args:
+            filepath: Destination path; written as given, without an
+                added .npz suffix
+        """
+        self._finalize()
+        with open(filepath, 'wb') as f:
+            np.savez(
+                f,
+                directed=np.array(self.directed),
+                nodes=np.array([str(node) for node in self.get_nodes()], dtype=str),
+                indptr=self._indptr,
+                indices=self._indices,
+                data=self._data
+            )
     
     @classmethod
     def load_from_file(cls, filepath: str) -> 'SparseGraph':
-        """Load graph from text file."""
+        """
+        Load graph from a file written by save_to_file.
+        
+        Files in the older one-edge-per-line text format are detected and
+        loaded through the legacy parser.
+        
+        Args:
+            filepath: Path to a .npz or legacy text graph file
+            
+        Returns:
+            Loaded SparseGraph
+        """
+        with open(filepath, 'rb') as f:
+            is_npz = f.read(4) == b'PK\x03\x04'
+        if not is_npz:
+            return cls._load_text_file(filepath)
+        
+        with np.load(filepath) as archive:
+            graph = cls(directed=bool(archive['directed']))
+            for node_id in archive['nodes'].tolist():
+                graph.add_node(node_id)
+            graph._indptr = archive['indptr'].astype(np.int64, copy=False)
+            graph._indices = archive['indices'].astype(np.int32, copy=False)
+            graph._data = archive['data'].astype(np.float64, copy=False)
+        graph._version += 1
+        
+        return graph
+    
+    @classmethod
+    def _load_text_file(cls, filepath: str) -> 'SparseGraph':
+        """Load graph from the legacy text format."""
         with open(filepath, 'r') as f:
             lines = f.readlines()
         
@@ -207,6 +559,7 @@ class SparseGraph:
         graph = cls(directed=directed)
         
         # Parse edges
+        edges = []
         for line in lines[3:]:  # Skip header lines
             if line.strip():
                 parts = line.strip().split(',')
@@ -214,50 +567,88 @@ class SparseGraph:
                     source = parts[0]
                     target = parts[1]
                     weight = float(parts[2]) if len(parts) > 2 else 1.0
-                    graph.add_edge(source, target, weight)
+                    edges.append((source, target, weight))
+        graph.add_edges_from(edges)
         
         return graph
     
     def __str__(self) -> str:
         """String representation of the graph."""
-        return (f"SparseGraph(nodes={len(self._adjacency_list)}, "
-                f"edges={self._edge_count}, directed={self.directed})")
+        return (f"SparseGraph(nodes={len(self)}, "
+                f"edges={self.get_edge_count()}, directed={self.directed})")
     
     def __len__(self) -> int:
         """Number of nodes in the graph."""
-        return len(self._adjacency_list)
+        return len(self._node_to_idx)
     
-    def to_sparse_matrix(self):
-        node_ids = list(self._adjacency_list.keys())
-        n = len(node_ids)
-        row, col, data = [], [], []
-
-        for source, neighbors in self._adjacency_list.items():
-            u = self._node_to_idx[source]
-            total_weight = sum(neighbors.values())
-            if total_weight == 0: continue # جلوگیری از تقسیم بر صفر
-        
-            for target, weight in neighbors.items():
-                v = self._node_to_idx[target]
-                row.append(v)  # مقصد (Row)
-                col.append(u)  # مبدا (Column)
-                data.append(weight / total_weight)
+    def to_sparse_matrix(
+        self,
+        index_dtype: DTypeLike = np.int32
+    ) -> Tuple[sparse.csr_matrix, List[str]]:
+        """
+        Get the column-stochastic transition matrix and node ids.
+        
+        The result is cached per index dtype until the graph is next mutated.
+        
+        Args:
+            index_dtype: Type of indptr and indices, np.int32 (default) or
+                np.int64. int32 halves the index traffic of every SpMV;
+                scipy.sparse has no narrower index type
+            
+        Returns:
+            Tuple of (transition_matrix, node_ids)
             
-        return sparse.coo_matrix((data, (row, col)), shape=(n, n)).tocsr(), node_ids
+        Raises:
+            ValueError: For other index dtypes, or if the graph is too
+                large for int32 indices
+        """
+        index_dtype = np.dtype(index_dtype)
+        if index_dtype not in (np.dtype(np.int32), np.dtype(np.int64)):
+            raise ValueError(f"index_dtype must be int32 or int64, got {index_dtype}")
+        return self._cached(
+            ('transition', index_dtype), lambda: self._build_transition_matrix(index_dtype)
+        )
+    
+    def _build_transition_matrix(self, index_dtype: np.dtype):
+        # M[target, source] = weight / out-weight(source): scale each row of
+        # the adjacency matrix by its inverse out-weight, then transpose.
+        # Rows with zero out-weight stay zero, so no division by zero
+        adjacency, node_ids = self.get_sparse_adjacency_matrix()
+        out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+        inv_out_weight = np.zeros(len(node_ids), dtype=np.float64)
+        np.divide(1.0, out_weight, out=inv_out_weight, where=out_weight != 0)
+        
+        transition = (sparse.diags(inv_out_weight) @ adjacency).T.tocsr()
+        
+        # scipy picks the index type from the matrix size, so set it
+        # explicitly: the native SpMV kernel only takes int32
+        if max(transition.nnz, transition.shape[0]) > np.iinfo(index_dtype).max:
+            raise ValueError(f"Graph is too large for {index_dtype} indices")
+        transition.indptr = transition.indptr.astype(index_dtype, copy=False)
+        transition.indices = transition.indices.astype(index_dtype, copy=False)
+        return transition, node_ids
     def get_dangling_nodes(self):
-        n = len(self._adjacency_list)
-        dangling_mask = np.zeros(n, dtype=bool)
+        """
+        Get a boolean mask of nodes without outgoing edges.
+        
+        The result is cached until the graph is next mutated.
+        """
+        return self._cached('dangling', self._build_dangling_mask)
     
-        for node_id, neighbors in self._adjacency_list.items():
-            if not neighbors:
-                idx = self._node_to_idx[node_id]
-                dangling_mask[idx] = True
-            
-        return dangling_mask
+    def _build_dangling_mask(self):
+        self._finalize()
+        return np.diff(self._indptr) == 0
     def get_normalized_matrix(self):
+        """
+        Get the column-stochastic transition matrix, dangling mask and node ids.
+        
+        The result is cached until the graph is next mutated, so repeated
+        PageRank runs on the same graph skip the O(E) rebuild.
+        """
         matrix, node_ids = self.to_sparse_matrix()
-        dangling_mask = self.get_dangling_nodes()
-        return matrix, dangling_mask, node_ids
+        return self._cached(
+            'normalized', lambda: (matrix, self.get_dangling_nodes(), node_ids)
+        )
     def load_congress_data(self, json_path):
         import json
         with open(json_path, 'r') as f:
@@ -270,11 +661,10 @@ class SparseGraph:
         for name in usernames:
             self.add_node(name)
             
-        for i, targets in enumerate(out_list):
-            source = usernames[i]
-            for j, target_idx in enumerate(targets):
-                target = usernames[target_idx]
-                weight = out_weight[i][j]
-                self.add_edge(source, target, weight)
+        self.add_edges_from(
+            (usernames[i], usernames[target_idx], out_weight[i][j])
+            for i, targets in enumerate(out_list)
+            for j, target_idx in enumerate(targets)
+        )
         
         return usernames
\ No newline at end of file
@@ -0,0 +1,56 @@
+/*
+ * CSR sparse matrix-vector product y = A x for the PageRank power iteration.
+ *
+ * Loaded at runtime through ctypes by domain/kernels.py. Build in place with:
+ *
+ *     cc -O3 -march=native -shared -fPIC -o backend/native/libspmv.so backend/native/spmv.c
+ *
+ * With AVX2/FMA available the inner loop gathers four x[indices[k]] values at
+ * a time and accumulates with fused multiply-adds; otherwise it falls back to
+ * an unrolled scalar loop. SpMV is memory-bound, so most of the gain comes
+ * from the unrolling and fewer loads per entry rather than FMA throughput.
+ */
+
+#include <stdint.h>
+
+#if defined(__AVX2__) && defined(__FMA__)
+#include <immintrin.h>
+#endif
+
+void csr_spmv_f64(const int32_t *indptr, const int32_t *indices,
+                  const double *data, const double *x, double *y, int32_t n)
+{
+    for (int32_t i = 0; i < n; ++i) {
+        int32_t k = indptr[i];
+        const int32_t end = indptr[i + 1];
+        double acc = 0.0;
+
+#if defined(__AVX2__) && defined(__FMA__)
+        __m256d vacc = _mm256_setzero_pd();
+        for (; k + 4 <= end; k += 4) {
+            __m128i cols = _mm_loadu_si128((const __m128i *)(indices + k));
+            __m256d xs = _mm256_i32gather_pd(x, cols, 8);
+            __m256d vals = _mm256_loadu_pd(data + k);
+            vacc = _mm256_fmadd_pd(vals, xs, vacc);
+        }
+        __m128d lo = _mm256_castpd256_pd128(vacc);
+        __m128d hi = _mm256_extractf128_pd(vacc, 1);
+        lo = _mm_add_pd(lo, hi);
+        acc = _mm_cvtsd_f64(_mm_add_sd(lo, _mm_unpackhi_pd(lo, lo)));
+#else
+        double acc1 = 0.0, acc2 = 0.0, acc3 = 0.0;
+        for (; k + 4 <= end; k += 4) {
+            acc  += data[k]     * x[indices[k]];
+            acc1 += data[k + 1] * x[indices[k + 1]];
+            acc2 += data[k + 2] * x[indices[k + 2]];
+            acc3 += data[k + 3] * x[indices[k + 3]];
+        }
+        acc += (acc1 + acc2) + acc3;
+#endif
+
+        for (; k < end; ++k) {
+            acc += data[k] * x[indices[k]];
+        }
+        y[i] = acc;
+    }
+}
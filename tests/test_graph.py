@@ -0,0 +1,31 @@
+"""
+Tests for SparseGraph.
+"""
+
+import threading
+
+from backend.infrastructure.graph import SparseGraph
+
+
+def test_concurrent_first_reads_see_every_edge():
+    graph = SparseGraph(directed=True)
+    for i in range(20000):
+        graph.add_edge(f'n{i % 500}', f'n{(i * 7 + 1) % 500}', 1.0 + i % 3)
+    expected_count = len({(i % 500, (i * 7 + 1) % 500) for i in range(20000)})
+
+    readers = 8
+    barrier = threading.Barrier(readers)
+    results = [None] * readers
+
+    def read(slot):
+        barrier.wait()
+        results[slot] = sorted(graph.get_edges())
+
+    threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results[0]) == expected_count
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,37 @@
+"""
+Tests for PowerIterationEngine.
+"""
+
+import pytest
+from scipy import sparse
+
+from backend.domain.pagerank import PowerIterationEngine
+
+
+@pytest.mark.parametrize('solver', [
+    'compute_page_rank',
+    'compute_sparse_page_rank',
+    'compute_neumann_page_rank',
+    'compute_gauss_seidel_page_rank',
+])
+def test_empty_graph_returns_empty_scores(solver):
+    engine = PowerIterationEngine()
+
+    scores = getattr(engine, solver)([], sparse.csr_matrix((0, 0)))
+
+    assert scores == {}
+    assert engine._converged
+    assert engine._iterations_performed == 0
+
+
+def test_top_fraud_candidates_break_ties_by_node_order():
+    engine = PowerIterationEngine()
+    values = [0.1, 0.3, 0.2, 0.3, 0.1, 0.3, 0.2, 0.1, 0.3, 0.2,
+              0.1, 0.3, 0.2, 0.3, 0.1, 0.3]
+    scores = {f'n{i}': value for i, value in enumerate(values)}
+    expected = sorted(scores, key=lambda node_id: -scores[node_id])
+
+    for top_k in range(1, len(scores) + 2):
+        candidates = engine.get_top_fraud_candidates(scores, top_k=top_k)
+
+        assert [node_id for node_id, _, _ in candidates] == expected[:top_k]
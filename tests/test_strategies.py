@@ -0,0 +1,45 @@
+"""
+Tests for the dangling node strategies.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from backend.domain.pagerank import PowerIterationEngine
+from backend.domain.strategies import (
+    BaseDanglingNodeStrategy,
+    UniformDanglingStrategy,
+)
+
+
+class DenseUniformStrategy(BaseDanglingNodeStrategy):
+    """Strategy written against the dense-only contract."""
+
+    def handle_dangling_nodes(self, transition_matrix, dangling_mask):
+        n = transition_matrix.shape[0]
+        return np.where(dangling_mask[np.newaxis, :], 1.0 / n, transition_matrix)
+
+    def get_description(self):
+        return "Dense uniform redistribution"
+
+
+def test_strategy_without_as_operator_matches_built_in():
+    node_ids = ['a', 'b', 'c', 'd']
+    # Column j holds j's out-edges; d has none
+    adjacency = sparse.csr_matrix(np.array([
+        [0, 0, 1, 0],
+        [1, 0, 0, 0],
+        [1, 1, 0, 0],
+        [0, 1, 1, 0],
+    ], dtype=np.float64))
+    suspicious = {'a': 1.0}
+
+    expected = PowerIterationEngine(
+        dangling_strategy=UniformDanglingStrategy()
+    ).compute_page_rank(node_ids, adjacency, suspicious)
+    scores = PowerIterationEngine(
+        dangling_strategy=DenseUniformStrategy()
+    ).compute_page_rank(node_ids, adjacency, suspicious)
+
+    assert scores.keys() == expected.keys()
+    assert np.allclose(list(scores.values()), list(expected.values()))